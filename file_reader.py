@@ -3,8 +3,12 @@ Flexible file reading utility - supports both local files and GCS
 """
 
 import os
-from urllib.parse import urlparse
-from google.cloud import storage
+import logging
+from google.cloud.exceptions import NotFound
+from google_cloud_utility import get_storage_client, parse_gs
+
+logger = logging.getLogger(__name__)
+
 
 def read_file_content(file_path):
     """
@@ -25,37 +29,38 @@ def read_file_content(file_path):
     try:
         # Check if it's a GCS path
         if file_path.startswith('gs://'):
-            print(f"Reading from GCS: {file_path}")
-            parsed = urlparse(file_path)
-            bucket_name = parsed.netloc
-            blob_path = parsed.path.lstrip('/')
+            logger.debug("Reading from GCS: %s", file_path)
+            bucket_name, blob_path = parse_gs(file_path)
             
-            client = storage.Client()
+            client = get_storage_client()
             bucket = client.bucket(bucket_name)
             blob = bucket.blob(blob_path)
             
-            if not blob.exists():
+            # Download raw bytes and decode once - skips download_as_text's charset detection.
+            # A missing object surfaces as NotFound, so no separate exists() round-trip is needed
+            try:
+                content = blob.download_as_bytes().decode('utf-8')
+            except NotFound:
                 raise FileNotFoundError(f"GCS file not found: {file_path}")
-            
-            content = blob.download_as_text()
-            print(f"✓ Read {len(content)} characters from GCS")
+            logger.debug("✓ Read %d characters from GCS", len(content))
             return content
         
         else:
             # Local file path
-            print(f"Reading from local file: {file_path}")
+            logger.debug("Reading from local file: %s", file_path)
             
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Local file not found: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read raw bytes and decode once - skips the incremental TextIOWrapper decoder
+            with open(file_path, 'rb') as f:
+                content = f.read().decode('utf-8')
             
-            print(f"✓ Read {len(content)} characters from local file")
+            logger.debug("✓ Read %d characters from local file", len(content))
             return content
             
     except FileNotFoundError:
         raise
     except Exception as e:
-        print(f"✗ Error reading file {file_path}: {e}")
+        logger.error("✗ Error reading file %s: %s", file_path, e)
         raise Exception(f"Failed to read file {file_path}: {str(e)}")
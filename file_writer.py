@@ -3,66 +3,83 @@ Flexible file writing utility - supports both local files and GCS
 """
 
 import os
-import json
-from urllib.parse import urlparse
-from google.cloud import storage as gcs_storage
+import gzip
+import logging
+from google_cloud_utility import get_storage_client, validate_gs
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to stdlib json when the orjson wheel isn't available
+    orjson = None
+    import json
 
-def write_file_content(path, content):
+logger = logging.getLogger(__name__)
+
+
+def _dump_json(content, pretty=False):
+    """Serialize dict/list content to UTF-8 encoded JSON bytes (compact unless pretty)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(content, option=option)
+    if pretty:
+        return json.dumps(content, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(content, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_file_content(path, content, content_type=None, pretty=False, compress=True):
     """
     Write content to either local filesystem or GCS.
     
     Args:
         path: Destination path. Must be GCS path: gs://bucket/path/file.json
-        content: Content to write (dict, list, or string)
+        content: Content to write (dict, list, string, or already encoded bytes)
+        content_type: Optional content type override for the uploaded object
+        pretty: Indent dict/list JSON output for readability (compact by default)
+        compress: Upload gzip-compressed with Content-Encoding: gzip. GCS transcodes
+                  it back transparently for clients that don't accept gzip
     
     Raises:
         ValueError: If path is invalid
         Exception: For write errors
     """
-    # Convert dict/list to JSON string if needed
+    # Convert dict/list to JSON bytes if needed
     if isinstance(content, (dict, list)):
-        content_str = json.dumps(content, indent=4, ensure_ascii=False)
-        content_type = 'application/json'
+        content_bytes = _dump_json(content, pretty=pretty)
+        content_type = content_type or 'application/json'
+    elif isinstance(content, bytes):
+        content_bytes = content
+        content_type = content_type or 'application/octet-stream'
     else:
-        content_str = str(content)
-        content_type = 'text/plain'
+        content_bytes = str(content).encode('utf-8')
+        content_type = content_type or 'text/plain'
     
     try:
-        print(f"Writing to: {path}")
+        logger.debug("Writing to: %s", path)
         
-        # Validate it's a GCS path
-        if not path.startswith('gs://'):
-            raise ValueError(f"Path must start with gs://, got: {path}")
+        # Validate it's a complete GCS object path
+        bucket_name, blob_path = validate_gs(path)
         
-        parsed = urlparse(path)
-        bucket_name = parsed.netloc
-        blob_path = parsed.path.lstrip('/')
+        logger.debug("  Bucket: %s, Object: %s, Content size: %d bytes",
+                     bucket_name, blob_path, len(content_bytes))
         
-        # Validate bucket name
-        if not bucket_name:
-            raise ValueError(f"Invalid GCS path - no bucket name in: {path}")
-        
-        # Validate blob path (object name)
-        if not blob_path:
-            raise ValueError(f"Invalid GCS path - no object name in: {path}. Expected format: gs://bucket/path/file.json")
-        
-        print(f"  Bucket: {bucket_name}")
-        print(f"  Object: {blob_path}")
-        print(f"  Content size: {len(content_str)} characters")
-        
-        client = gcs_storage.Client()
+        client = get_storage_client()
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(blob_path)
-        blob.content_type = content_type
         
-        blob.upload_from_string(content_str)
-        print(f"✓ Successfully wrote to gs://{bucket_name}/{blob_path}")
+        if compress:
+            # Level 1 gets most of the size reduction for JSON at a fraction of the CPU
+            content_bytes = gzip.compress(content_bytes, compresslevel=1)
+            blob.content_encoding = 'gzip'
+            logger.debug("  Compressed size: %d bytes", len(content_bytes))
+        
+        blob.upload_from_string(content_bytes, content_type=content_type)
+        logger.debug("✓ Successfully wrote to gs://%s/%s", bucket_name, blob_path)
         
     except ValueError:
         raise
     except Exception as e:
-        print(f"✗ Error writing to {path}: {type(e).__name__}: {e}")
-        import traceback
-        print(f"Traceback:\n{traceback.format_exc()}")
+        logger.exception("✗ Error writing to %s: %s: %s", path, type(e).__name__, e)
         raise Exception(f"Failed to write to GCS: {str(e)}")
\ No newline at end of file
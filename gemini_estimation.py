@@ -1,9 +1,23 @@
 import json
-import time
-import threading
-import traceback
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
-from pydantic import BaseModel
+from google.genai import types
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+USER_SCRIPT_PLACEHOLDER = '{USER_SCRIPT}'
+
+logger = logging.getLogger(__name__)
+
+# Loaded prompts keyed by (system_prompt_path, user_prompt_template_path)
+_PROMPT_CACHE = {}
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 # Import flexible I/O functions
 from file_reader import read_file_content
@@ -39,18 +53,84 @@ class Output(BaseModel):
     confidence_level: str
 
 
-def progress_counter(stop_event):
+# Full schema validation is only run in debug mode - the hot path checks JSON syntax only
+OUTPUT_ADAPTER = TypeAdapter(list[Output])
+
+
+async def progress_counter():
     """Display progress updates while waiting for Gemini response"""
     seconds = 0
-    while not stop_event.is_set():
-        time.sleep(5)
+    while True:
+        await asyncio.sleep(5)
         seconds += 5
-        if not stop_event.is_set():
-            print(f"Still waiting... ({seconds}s elapsed)")
+        logger.info("Still waiting... (%ds elapsed)", seconds)
+
+
+def get_cached_prompts(system_prompt_path, user_prompt_template_path):
+    """Return already loaded prompts for these paths without blocking, or None on a miss"""
+    return _PROMPT_CACHE.get((system_prompt_path, user_prompt_template_path))
+
+
+def load_prompts(system_prompt_path, user_prompt_template_path):
+    """Read and validate the system prompt and user prompt template.
+    
+    Prompt files are immutable per deploy, so results are cached for the
+    lifetime of the process. Failed loads raise and are not cached.
+    
+    Args:
+        system_prompt_path: Path to system prompt file
+        user_prompt_template_path: Path to user prompt template file
+    
+    Returns:
+        tuple: (system_prompt, system_message, user_prompt_parts) where system_message
+               is the prebuilt request Content for the system prompt and user_prompt_parts
+               is the template pre-split around the placeholder as (prefix, suffix)
+    
+    Raises:
+        ValueError: If either prompt is empty or the template has no placeholder
+    """
+    prompts = get_cached_prompts(system_prompt_path, user_prompt_template_path)
+    if prompts is not None:
+        return prompts
+
+    # Load both prompts concurrently - fail if either is not found
+    logger.info("Reading system prompt from: %s", system_prompt_path)
+    logger.info("Reading user prompt template from: %s", user_prompt_template_path)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        system_prompt_future = executor.submit(read_file_content, system_prompt_path)
+        user_prompt_template_future = executor.submit(read_file_content, user_prompt_template_path)
+        system_prompt = system_prompt_future.result()
+        user_prompt_template = user_prompt_template_future.result()
+
+    if not system_prompt or system_prompt.strip() == "":
+        error_msg = f"System prompt file is empty or could not be read: {system_prompt_path}"
+        logger.error("✗ Error: %s", error_msg)
+        raise ValueError(error_msg)
+    logger.info("✓ Loaded system prompt (%d characters)", len(system_prompt))
 
+    if not user_prompt_template or user_prompt_template.strip() == "":
+        error_msg = f"User prompt template file is empty or could not be read: {user_prompt_template_path}"
+        logger.error("✗ Error: %s", error_msg)
+        raise ValueError(error_msg)
+    logger.info("✓ Loaded user prompt template (%d characters)", len(user_prompt_template))
 
-def run_estimation(provider=None, params_content=None, output_path=None, debug=False, 
-                   api_key=None, model=None, system_prompt_path=None, user_prompt_template_path=None):
+    # Validate and pre-split the template around the placeholder once
+    user_prompt_prefix, placeholder, user_prompt_suffix = user_prompt_template.partition(USER_SCRIPT_PLACEHOLDER)
+    if not placeholder:
+        error_msg = f"User prompt template must contain '{USER_SCRIPT_PLACEHOLDER}' placeholder. Template: {user_prompt_template_path}"
+        logger.error("✗ Error: %s", error_msg)
+        raise ValueError(error_msg)
+
+    # Build the static half of the request payload once
+    system_message = types.Content(role="user", parts=[types.Part(text=system_prompt)])
+
+    prompts = (system_prompt, system_message, (user_prompt_prefix, user_prompt_suffix))
+    _PROMPT_CACHE[(system_prompt_path, user_prompt_template_path)] = prompts
+    return prompts
+
+
+async def run_estimation(provider=None, params_content=None, output_path=None, debug=False, 
+                         api_key=None, model=None, system_prompt_path=None, user_prompt_template_path=None):
     """Run the resource estimation process with Gemini.
     
     Args:
@@ -67,84 +147,68 @@ def run_estimation(provider=None, params_content=None, output_path=None, debug=F
         bool: True if successful, False otherwise
     """
     if provider != 'gemini':
-        print(f"Error: Only 'gemini' provider is supported, got: {provider}")
+        logger.error("Error: Only 'gemini' provider is supported, got: %s", provider)
         return False
     
     if not api_key:
-        print("Error: Missing API key for Gemini")
+        logger.error("Error: Missing API key for Gemini")
         return False
     
     if not params_content:
-        print("Error: Missing params_content")
+        logger.error("Error: Missing params_content")
         return False
     
     if not output_path:
-        print("Error: Missing output_path")
+        logger.error("Error: Missing output_path")
         return False
 
-    print(f"Starting estimation with Gemini...")
-    print(f"  Model: {model}")
-    print(f"  Script content length: {len(params_content)} characters")
-    print(f"  Output path: {output_path}")
-    print(f"  Debug mode: {debug}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Starting estimation with Gemini...")
+        logger.debug("  Model: %s", model)
+        logger.debug("  Script content length: %d characters", len(params_content))
+        logger.debug("  Output path: %s", output_path)
+        logger.debug("  Debug mode: %s", debug)
 
     try:
         # Initialize Gemini client
         client = genai.Client(api_key=api_key)
-        print("✓ Gemini client initialized")
+        logger.debug("✓ Gemini client initialized")
         
-        # Load system prompt - fail if not found
-        print(f"Reading system prompt from: {system_prompt_path}")
-        system_prompt = read_file_content(system_prompt_path)
-        if not system_prompt or system_prompt.strip() == "":
-            error_msg = f"System prompt file is empty or could not be read: {system_prompt_path}"
-            print(f"✗ Error: {error_msg}")
-            raise ValueError(error_msg)
-        print(f"✓ Loaded system prompt ({len(system_prompt)} characters)")
-
-        # Load user prompt template - fail if not found
-        print(f"Reading user prompt template from: {user_prompt_template_path}")
-        user_prompt_template = read_file_content(user_prompt_template_path)
-        if not user_prompt_template or user_prompt_template.strip() == "":
-            error_msg = f"User prompt template file is empty or could not be read: {user_prompt_template_path}"
-            print(f"✗ Error: {error_msg}")
-            raise ValueError(error_msg)
-        print(f"✓ Loaded user prompt template ({len(user_prompt_template)} characters)")
-
-        # Validate template has the required placeholder
-        if '{USER_SCRIPT}' not in user_prompt_template:
-            error_msg = f"User prompt template must contain '{{USER_SCRIPT}}' placeholder. Template: {user_prompt_template_path}"
-            print(f"✗ Error: {error_msg}")
-            raise ValueError(error_msg)
-
-        # Format the user prompt
-        print("Formatting user prompt with script content...")
-        user_prompt = user_prompt_template.format(USER_SCRIPT=params_content)
-        print(f"✓ User prompt formatted successfully ({len(user_prompt)} characters)")
+        # Load prompts - served from the cache after the startup preload, so only
+        # a cold load is handed off to a worker thread
+        prompts = get_cached_prompts(system_prompt_path, user_prompt_template_path)
+        if prompts is None:
+            prompts = await asyncio.to_thread(load_prompts, system_prompt_path, user_prompt_template_path)
+        system_prompt, system_message, user_prompt_parts = prompts
+        user_prompt_prefix, user_prompt_suffix = user_prompt_parts
+
+        # Format the user prompt - plain concatenation around the pre-split template
+        user_prompt = user_prompt_prefix + params_content + user_prompt_suffix
+        logger.debug("✓ User prompt formatted successfully (%d characters)", len(user_prompt))
 
+        # Output requested with "debug": true is logged at INFO so it shows with the default LOG_LEVEL
         if debug:
-            print(f"\n--- DEBUG INFO ---")
-            print(f"System prompt length: {len(system_prompt)}")
-            print(f"User prompt length: {len(user_prompt)}")
-            print(f"System prompt preview: {system_prompt[:200]}...")
-            print(f"User prompt preview: {user_prompt[:200]}...")
-            print(f"--- END DEBUG ---\n")
-
-        print('Waiting for a response from Gemini...')
-        print('This may take 30-60 seconds for complex analysis...')
-
-        # Start progress counter
-        stop_event = threading.Event()
-        progress_thread = threading.Thread(target=progress_counter, args=(stop_event,))
-        progress_thread.daemon = True
-        progress_thread.start()
+            logger.info("--- DEBUG INFO ---")
+            logger.info("System prompt length: %d", len(system_prompt))
+            logger.info("User prompt length: %d", len(user_prompt))
+            logger.info("System prompt preview: %s...", system_prompt[:200])
+            logger.info("User prompt preview: %s...", user_prompt[:200])
+            logger.info("--- END DEBUG ---")
+
+        logger.debug('Waiting for a response from Gemini (may take 30-60 seconds)...')
+
+        # Start progress counter - skipped when its INFO messages would be filtered out
+        progress_task = None
+        if logger.isEnabledFor(logging.INFO):
+            progress_task = asyncio.create_task(progress_counter())
 
         try:
-            response = client.models.generate_content(
+            # Stream the response so chunks are consumed as they are generated
+            stream = await client.aio.models.generate_content_stream(
                 model=model,
                 contents=[
-                    {"role": "user", "parts": [{"text": system_prompt}]},
-                    {"role": "user", "parts": [{"text": user_prompt}]}
+                    system_message,
+                    types.Content(role="user", parts=[types.Part(text=user_prompt)])
                 ],
                 config={
                     'temperature': 0.2,
@@ -155,42 +219,48 @@ def run_estimation(provider=None, params_content=None, output_path=None, debug=F
                     'response_schema': list[Output]
                 }
             )
-
-            if debug:
-                print(f"\n--- DEBUG: Raw response ---")
-                print(getattr(response, "text", "No text attribute"))
-                print(f"--- END DEBUG ---\n")
-
-            output = response.parsed
-            stop_event.set()
-            progress_thread.join(timeout=1)
-
-            print('✓ Received response from Gemini!')
-            
-            # Write output to file
-            if output:
-                output_data = [o.model_dump() for o in output]
-                write_file_content(output_path, output_data)
-                print(f"✓ Output saved to: {output_path}")
-                return True
-            else:
-                print("✗ No output received from Gemini")
-                return False
-
+            response_text = ''.join([chunk.text async for chunk in stream if chunk.text])
+            raw_output = response_text.encode('utf-8')
         except Exception as api_error:
-            stop_event.set()
-            progress_thread.join(timeout=1)
-            print(f"✗ Gemini API call failed: {api_error}")
-            if debug:
-                print(f"Traceback:\n{traceback.format_exc()}")
+            logger.error("✗ Gemini API call failed: %s", api_error, exc_info=debug)
             raise api_error
+        finally:
+            if progress_task is not None:
+                progress_task.cancel()
+
+        if debug:
+            logger.info("--- DEBUG: Raw response ---\n%s\n--- END DEBUG ---", response_text)
+
+        logger.debug('✓ Received response from Gemini!')
+
+        # Parse once to make sure the response is valid JSON before uploading it
+        try:
+            output = json_loads(raw_output) if raw_output else None
+        except ValueError as parse_error:
+            logger.error("✗ Gemini returned invalid JSON: %s", parse_error)
+            return False
 
-    except Exception as e:
-        print(f"✗ Gemini estimation failed: {e}")
         if debug:
-            print(f"Full traceback:\n{traceback.format_exc()}")
+            try:
+                OUTPUT_ADAPTER.validate_python(output)
+                logger.info("✓ Output matches the Output schema")
+            except ValidationError as validation_error:
+                logger.error("✗ Gemini output does not match the Output schema: %s", validation_error)
+                return False
+        
+        # Write the raw JSON bytes to file - no re-serialization needed
+        if output:
+            await asyncio.to_thread(write_file_content, output_path, raw_output, content_type='application/json')
+            logger.debug("✓ Output saved to: %s", output_path)
+            return True
+        else:
+            logger.error("✗ No output received from Gemini")
+            return False
+
+    except Exception as e:
+        logger.error("✗ Gemini estimation failed: %s", e, exc_info=debug)
         return False
 
 
 if __name__ == '__main__':
-    run_estimation()
\ No newline at end of file
+    asyncio.run(run_estimation())
\ No newline at end of file
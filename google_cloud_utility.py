@@ -3,18 +3,83 @@ Google Cloud utilities for Secret Manager and other GCP services
 """
 
 import os
+import logging
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import secretmanager
+from google.cloud import storage as gcs_storage
+from requests.adapters import HTTPAdapter
+
+# Connection pool size for the storage client's HTTP session. The requests
+# default of 10 makes concurrent requests queue for a free connection
+GCS_POOL_SIZE = 32
+
+logger = logging.getLogger(__name__)
+
+# Clients are created lazily and reused for the lifetime of the process so
+# credentials, auth tokens and HTTP/gRPC channels are not rebuilt per request
+_STORAGE_CLIENT = None
+_SECRET_MANAGER_CLIENT = None
+
+
+def get_storage_client():
+    """Return the process-wide Cloud Storage client"""
+    global _STORAGE_CLIENT
+    if _STORAGE_CLIENT is None:
+        credentials, project = google.auth.default(scopes=gcs_storage.Client.SCOPE)
+        session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(pool_connections=GCS_POOL_SIZE, pool_maxsize=GCS_POOL_SIZE)
+        session.mount('https://', adapter)
+        _STORAGE_CLIENT = gcs_storage.Client(project=project, credentials=credentials, _http=session)
+    return _STORAGE_CLIENT
+
+
+def get_secret_manager_client():
+    """Return the process-wide Secret Manager client"""
+    global _SECRET_MANAGER_CLIENT
+    if _SECRET_MANAGER_CLIENT is None:
+        _SECRET_MANAGER_CLIENT = secretmanager.SecretManagerServiceClient()
+    return _SECRET_MANAGER_CLIENT
+
+
+def parse_gs(path):
+    """
+    Split a gs://bucket/path/to/object path into (bucket_name, blob_path).
+    
+    Plain string split - gs:// paths never carry the ports, queries or
+    fragments urlparse is built to handle. Either part may be empty.
+    """
+    bucket_name, _, blob_path = path[len('gs://'):].partition('/')
+    return bucket_name, blob_path.lstrip('/')
+
+
+def validate_gs(path):
+    """
+    Validate a gs://bucket/path/to/object path and split it into (bucket_name, blob_path).
+    
+    Raises:
+        ValueError: If the path is not a gs:// path or is missing the bucket or object name
+    """
+    if not path or not path.startswith('gs://'):
+        raise ValueError(f"Path must start with gs://, got: {path}")
+    
+    bucket_name, blob_path = parse_gs(path)
+    if not bucket_name:
+        raise ValueError(f"Invalid GCS path - no bucket name in: {path}. Expected format: gs://bucket/path/file.json")
+    if not blob_path:
+        raise ValueError(f"Invalid GCS path - no object name in: {path}. Expected format: gs://bucket/path/file.json")
+    return bucket_name, blob_path
 
 
 def get_secret(project_id, secret_id, version_id="latest"):
     
-    client = secretmanager.SecretManagerServiceClient()
+    client = get_secret_manager_client()
     name = f"projects/{project_id}/secrets/{secret_id}/versions/{version_id}"
     
     try:
         response = client.access_secret_version(request={"name": name})
         payload = response.payload.data.decode('UTF-8')
-        print(f"Successfully retrieved secret: {secret_id}")
+        logger.info("Successfully retrieved secret: %s", secret_id)
         return payload
         
     except Exception as e:
@@ -1,25 +1,35 @@
 """
-Flask API for ML Training Resource Estimation using Gemini
-Designed to run on Google Cloud Run
+Quart (async Flask) API for ML Training Resource Estimation using Gemini
+Designed to run on Google Cloud Run under an ASGI server (uvicorn)
 """
 
 import os
-from flask import Flask, request, jsonify
-from urllib.parse import urlparse
+import asyncio
+import logging
+from quart import Quart, request, jsonify
 from file_reader import read_file_content
 from file_writer import write_file_content
-from gemini_estimation import run_estimation
-from google_cloud_utility import get_secret
+from gemini_estimation import run_estimation, load_prompts
+from google_cloud_utility import get_secret, get_storage_client, validate_gs
 
 TEEMO_VERSION = "1.0.1"
 
+# INFO by default so startup messages and "debug": true output are emitted.
+# Set LOG_LEVEL=DEBUG to also see per-request progress logs
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    format='%(levelname)s %(name)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
 # Configuration - Use absolute paths for Cloud Run reliability
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 GEMINI_MODEL = 'gemini-2.0-flash-exp'
+WARMUP_BUCKET = 'teemo-ops-estimate-output'
 SYSTEM_PROMPT = os.path.join(BASE_DIR, 'prompts', 'system_prompt.txt')
 USER_PROMPT_TEMPLATE = os.path.join(BASE_DIR, 'prompts', 'user_prompt_template.txt')
 
-app = Flask(__name__)
+app = Quart(__name__)
 
 # Get API key from Google Cloud Secret Manager
 try:
@@ -27,22 +37,34 @@ try:
         secret_id="gemini_api_key",
         project_id="587897013083"
     )
-    print("✓ Successfully loaded Gemini API key from Secret Manager")
+    logger.info("✓ Successfully loaded Gemini API key from Secret Manager")
 except Exception as e:
-    print(f"✗ Warning: Failed to load API key from Secret Manager: {e}")
+    logger.warning("✗ Failed to load API key from Secret Manager: %s", e)
     GEMINI_API_KEY = None
 
 # Verify prompt files exist at startup
-print(f"Teemo version: {TEEMO_VERSION}")
-print(f"Checking prompt files...")
-print(f"  System prompt: {SYSTEM_PROMPT}")
-print(f"  Exists: {os.path.exists(SYSTEM_PROMPT)}")
-print(f"  User prompt template: {USER_PROMPT_TEMPLATE}")
-print(f"  Exists: {os.path.exists(USER_PROMPT_TEMPLATE)}")
+logger.info("Teemo version: %s", TEEMO_VERSION)
+logger.info("Checking prompt files...")
+logger.info("  System prompt: %s (exists: %s)", SYSTEM_PROMPT, os.path.exists(SYSTEM_PROMPT))
+logger.info("  User prompt template: %s (exists: %s)", USER_PROMPT_TEMPLATE, os.path.exists(USER_PROMPT_TEMPLATE))
+
+# Load prompts once at startup - they are cached for all later requests
+try:
+    load_prompts(SYSTEM_PROMPT, USER_PROMPT_TEMPLATE)
+except Exception as e:
+    logger.warning("✗ Failed to preload prompts: %s", e)
+
+# Warm up the storage client so credentials, the auth token and the HTTP
+# channel are set up during startup instead of inside the first request
+try:
+    get_storage_client().bucket(WARMUP_BUCKET).exists()
+    logger.info("✓ Storage client warmed up (bucket: %s)", WARMUP_BUCKET)
+except Exception as e:
+    logger.warning("✗ Storage client warmup failed: %s", e)
 
 
 @app.route('/health', methods=['GET'])
-def health_check():
+async def health_check():
     """Health check endpoint for Cloud Run"""
     return jsonify({
         'status': 'healthy',
@@ -52,7 +74,7 @@ def health_check():
 
 
 @app.route('/estimate', methods=['POST'])
-def estimate():
+async def estimate():
     """
     Main estimation endpoint
     
@@ -71,7 +93,7 @@ def estimate():
     }
     """
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         if not data:
             return jsonify({
@@ -79,23 +101,9 @@ def estimate():
                 'message': 'No JSON data provided'
             }), 400
         
-        print(f"Received request: {data}")
+        logger.debug("Received request: %s", data)
         
-        # Get parameters path (required)
-        params_path = data.get('params_path')
-        if not params_path:
-            return jsonify({
-                'status': 'error',
-                'message': 'params_path is required'
-            }), 400
-        
-        print(f"Parameters path: {params_path}")
-        
-        # Read parameters content from GCS
-        params_content = read_file_content(params_path)
-        print(f"✓ Read {len(params_content)} characters from params file")
-        
-        # Get output path (required)
+        # Get output path (required) and validate it before doing any I/O
         output_path = data.get('output_path')
         if not output_path:
             return jsonify({
@@ -103,36 +111,25 @@ def estimate():
                 'message': 'output_path is required'
             }), 400
         
-        # Validate output path format
-        print(f"Validating output path: {output_path}")
-        
-        if not output_path.startswith('gs://'):
+        try:
+            bucket_name, blob_path = validate_gs(output_path)
+        except ValueError as e:
             return jsonify({
                 'status': 'error',
-                'message': f'output_path must start with gs://, got: {output_path}'
+                'message': f'Invalid output_path - {e}'
             }), 400
         
-        # Parse and validate
-        parsed = urlparse(output_path)
-        bucket_name = parsed.netloc
-        blob_path = parsed.path.lstrip('/')
+        logger.debug("✓ Output path validated: bucket=%s, object=%s", bucket_name, blob_path)
         
-        if not bucket_name:
-            return jsonify({
-                'status': 'error',
-                'message': f'Invalid output_path - missing bucket name. Format: gs://bucket/path/file.json'
-            }), 400
-        
-        if not blob_path:
+        # Get parameters path (required)
+        params_path = data.get('params_path')
+        if not params_path:
             return jsonify({
                 'status': 'error',
-                'message': f'Invalid output_path - missing file name. Got: {output_path}. Expected: gs://{bucket_name}/path/file.json'
+                'message': 'params_path is required'
             }), 400
         
-        print(f"✓ Output path validated:")
-        print(f"  Bucket: {bucket_name}")
-        print(f"  Object: {blob_path}")
-        print(f"  Full path: {output_path}")
+        logger.debug("Parameters path: %s", params_path)
         
         # Check API key from Secret Manager
         if not GEMINI_API_KEY:
@@ -141,13 +138,17 @@ def estimate():
                 'message': 'GEMINI_API_KEY not configured in Secret Manager'
             }), 500
         
+        # Read parameters content from GCS (blocking SDK call off the event loop)
+        params_content = await asyncio.to_thread(read_file_content, params_path)
+        logger.debug("✓ Read %d characters from params file", len(params_content))
+        
         # Get debug flag
         debug = data.get('debug', False)
-        print(f"Debug mode: {debug}")
+        logger.debug("Debug mode: %s", debug)
         
         # Run estimation
-        print("Starting estimation...")
-        success = run_estimation(
+        logger.debug("Starting estimation...")
+        success = await run_estimation(
             provider='gemini',
             params_content=params_content,
             output_path=output_path,
@@ -159,23 +160,21 @@ def estimate():
         )
         
         if success:
-            print(f"✅ Estimation completed successfully!")
+            logger.info("✅ Estimation completed successfully: %s", output_path)
             return jsonify({
                 'status': 'success',
                 'message': 'Estimation completed successfully',
                 'output_path': output_path
             }), 200
         else:
-            print(f"❌ Estimation failed")
+            logger.error("❌ Estimation failed")
             return jsonify({
                 'status': 'error',
                 'message': 'Estimation failed - check logs for details'
             }), 500
             
     except Exception as e:
-        print(f"Error in estimate endpoint: {e}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Error in estimate endpoint: %s", e)
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -183,7 +182,7 @@ def estimate():
 
 
 @app.route('/', methods=['GET'])
-def root():
+async def root():
     """Root endpoint with API documentation"""
     return jsonify({
         'service': 'ML Training Resource Estimation API',